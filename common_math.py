@@ -29,6 +29,10 @@ import secrets
 class ModInt:
     """Modular integer (slide 23)."""
 
+    # We create lots of these (and of the classes below),
+    # so avoid the memory and time overhead of a __dict__ for each.
+    __slots__ = ("r", "q")
+
     def __init__(self, r, q):
         """Build r mod q."""
         self.r = r % q
@@ -42,6 +46,10 @@ class ModInt:
         """Compare to another ModInt."""
         return self.r == other.r and self.q == other.q
 
+    def __hash__(self):
+        """Hash consistently with __eq__ (objects are immutable)."""
+        return hash((self.r, self.q))
+
     def __add__(self, other):
         """Add another ModInt."""
         return type(self)(self.r + other.r, self.q)
@@ -78,6 +86,8 @@ class ModInt:
 class ModPol:
     """Element of R_q (slides 25-27)."""
 
+    __slots__ = ("c", "q", "n")
+
     coef_cls = ModInt
 
     def __init__(self, q, n, c):
@@ -110,6 +120,10 @@ class ModPol:
         # Comparison of q and n are implied by comparing coefficients
         return self.c == other.c
 
+    def __hash__(self):
+        """Hash consistently with __eq__."""
+        return hash(self.c)
+
     def __add__(self, other):
         """Add another ModPol."""
         c = [a + b for a, b in zip(self.c, other.c)]
@@ -150,6 +164,8 @@ class ModPol:
 class Vec:
     """Element of R_q^k, ie vector of ModPols (slide 28)."""
 
+    __slots__ = ("v",)
+
     item_cls = ModPol
 
     def __init__(self, v):
@@ -179,6 +195,10 @@ class Vec:
         """Compare to another Vec."""
         return self.v == other.v
 
+    def __hash__(self):
+        """Hash consistently with __eq__."""
+        return hash(self.v)
+
     def __add__(self, other):
         """Add another Vec."""
         v = [a + b for a, b in zip(self.v, other.v)]
@@ -203,6 +223,8 @@ class Vec:
 class Mat:
     """Matrix of elements of R_q."""
 
+    __slots__ = ("lines",)
+
     item_cls = ModPol
     line_cls = Vec
 
@@ -227,6 +249,10 @@ class Mat:
         """Compare to another Mat."""
         return self.lines == other.lines
 
+    def __hash__(self):
+        """Hash consistently with __eq__."""
+        return hash(self.lines)
+
     def __matmul__(self, vec):
         """Multiply by a Vec."""
         v = [l * vec for l in self.lines]
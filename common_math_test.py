@@ -27,6 +27,10 @@ class ModIntTest(unittest.TestCase):
         self.assertNotEqual(ModInt(5, 17), ModInt(4, 17))
         self.assertNotEqual(ModInt(5, 17), ModInt(5, 16))
 
+    def test_hash(self):
+        self.assertEqual(hash(ModInt(22, 17)), hash(ModInt(5, 17)))
+        self.assertEqual(len({ModInt(5, 17), ModInt(-12, 17), ModInt(5, 16)}), 2)
+
     def test_add(self):
         self.assertEqual(ModInt(9, 17) + ModInt(15, 17), ModInt(7, 17))
 
@@ -51,48 +55,24 @@ class ModIntTest(unittest.TestCase):
     def test_rand_uni(self):
         # Don't actually test the distribution,
         # only the output range.
-        seen0, seen1, seen2 = 0, 0, 0
         times = 30
-        for _ in range(times):
-            r = ModInt.rand_uni(3)
-            if r == ModInt(0, 3):
-                seen0 += 1
-            if r == ModInt(1, 3):
-                seen1 += 1
-            if r == ModInt(2, 3):
-                seen2 += 1
-        self.assertNotEqual(seen0, 0)
-        self.assertNotEqual(seen1, 0)
-        self.assertNotEqual(seen2, 0)
-        self.assertEqual(seen0 + seen1 + seen2, times)
+        seen = {int(ModInt.rand_uni(3)) for _ in range(times)}
+        self.assertEqual(seen, {0, 1, 2})
 
     def test_rand_small_uni(self):
         # Don't actually test the distribution,
         # only the output range.
-        seen0, seen1, seen2, seenm1, seenm2 = 0, 0, 0, 0, 0
         times = 50
         q = 3329
-        for _ in range(times):
-            r = ModInt.rand_small_uni(q, 2)
-            if r == ModInt(0, q):
-                seen0 += 1
-            if r == ModInt(1, q):
-                seen1 += 1
-            if r == ModInt(2, q):
-                seen2 += 1
-            if r == ModInt(-1, q):
-                seenm1 += 1
-            if r == ModInt(-2, q):
-                seenm2 += 1
-        self.assertNotEqual(seen0, 0)
-        self.assertNotEqual(seen1, 0)
-        self.assertNotEqual(seen2, 0)
-        self.assertNotEqual(seenm1, 0)
-        self.assertNotEqual(seenm2, 0)
-        self.assertEqual(seen0 + seen1 + seen2 + seenm1 + seenm2, times)
+        seen = {int(ModInt.rand_small_uni(q, 2)) for _ in range(times)}
+        self.assertEqual(seen, {0, 1, 2, q - 1, q - 2})
 
 
 class ModPolTest(unittest.TestCase):
+    # Example from slide 26
+    f = modpol(41, 4, [32, 0, 17, 22])
+    g = modpol(41, 4, [11, 7, 19, 1])
+
     def test_equal(self):
         r0 = modpol(41, 4, [39, 35, 35, 24])
         r1 = modpol(41, 4, [-2, 35, -6, 24])
@@ -106,32 +86,30 @@ class ModPolTest(unittest.TestCase):
         r3 = modpol(43, 4, [39, 35, 35, 25])
         self.assertNotEqual(r0, r3)
 
+    def test_hash(self):
+        r0 = modpol(41, 4, [39, 35, 35, 24])
+        r1 = modpol(41, 4, [-2, 35, -6, 24])
+        self.assertEqual(hash(r0), hash(r1))
+        self.assertEqual(len({r0, r1, self.f, self.g}), 3)
+
     def test_add(self):
-        # Example from slide 26
-        f = modpol(41, 4, [32, 0, 17, 22])
-        g = modpol(41, 4, [11, 7, 19, 1])
         # result computed manually
         s = modpol(41, 4, [2, 7, 36, 23])
-        self.assertEqual(f + g, s)
-        self.assertEqual(g + f, s)
+        self.assertEqual(self.f + self.g, s)
+        self.assertEqual(self.g + self.f, s)
 
     def test_sub(self):
-        # Example from slide 26
-        f = modpol(41, 4, [32, 0, 17, 22])
-        g = modpol(41, 4, [11, 7, 19, 1])
         # results computed manually
         d1 = modpol(41, 4, [21, 34, 39, 21])
         d2 = modpol(41, 4, [-21, -34, -39, -21])
-        self.assertEqual(f - g, d1)
-        self.assertEqual(g - f, d2)
+        self.assertEqual(self.f - self.g, d1)
+        self.assertEqual(self.g - self.f, d2)
 
     def test_mul(self):
-        # Example from slide 26
-        f = modpol(41, 4, [32, 0, 17, 22])
-        g = modpol(41, 4, [11, 7, 19, 1])
+        # result from slide 26
         r = modpol(41, 4, [39, 35, 35, 24])
-        self.assertEqual(f * g, r)
-        self.assertEqual(g * f, r)
+        self.assertEqual(self.f * self.g, r)
+        self.assertEqual(self.g * self.f, r)
 
     def test_size(self):
         # Examples from slide 35
@@ -154,9 +132,7 @@ class ModPolTest(unittest.TestCase):
         # Ensure we get objects of the right shape
         q, n = 3, 2
         zero = modpol(q, n, [0, 0])  # proba 1 / 3^2
-        seen0 = False
-        for _ in range(100):
-            seen0 |= ModPol.rand_uni(q, n) == zero
+        seen0 = any(ModPol.rand_uni(q, n) == zero for _ in range(100))
         self.assertTrue(seen0)
 
     def test_rand_small_uni(self):
@@ -172,9 +148,7 @@ class ModPolTest(unittest.TestCase):
         # Ensure we get objects of the right shape
         q, n, eta = 3329, 2, 1
         zero = modpol(q, n, [0, 0])  # proba 1 / 3^2
-        seen0 = False
-        for _ in range(100):
-            seen0 |= ModPol.rand_small_uni(q, n, eta) == zero
+        seen0 = any(ModPol.rand_small_uni(q, n, eta) == zero for _ in range(100))
         self.assertTrue(seen0)
 
 
@@ -224,15 +198,16 @@ class VecTest(unittest.TestCase):
         # ModPol examples from slide 35 - let's create vectors out of them.
         f = modpol(41, 4, [1, 1, -2, 2])
         g = modpol(41, 4, [-2, 0, 2, -1])
+        fg = f * g
 
         self.assertEqual(vec(f, g).size(), 2)
         self.assertEqual(vec(g, f).size(), 2)
         self.assertEqual(vec(f, g, f).size(), 2)
         self.assertEqual(vec(g, f, g, f).size(), 2)
 
-        self.assertEqual(vec(f, g, f * g).size(), 8)
-        self.assertEqual(vec(f, f * g, g).size(), 8)
-        self.assertEqual(vec(f * g, f, g).size(), 8)
+        self.assertEqual(vec(f, g, fg).size(), 8)
+        self.assertEqual(vec(f, fg, g).size(), 8)
+        self.assertEqual(vec(fg, f, g).size(), 8)
 
     def test_rand_uni(self):
         # Don't actually test the distribution,
@@ -247,9 +222,7 @@ class VecTest(unittest.TestCase):
         # Ensure we get objects of the right shape
         q, n, k = 3, 2, 1
         zero = vec(modpol(q, n, [0, 0]))  # proba 1 / 3^(2*1)
-        seen0 = False
-        for _ in range(100):
-            seen0 |= Vec.rand_uni(q, n, k) == zero
+        seen0 = any(Vec.rand_uni(q, n, k) == zero for _ in range(100))
         self.assertTrue(seen0)
 
     def test_rand_small_uni(self):
@@ -266,9 +239,8 @@ class VecTest(unittest.TestCase):
         q, n, k, eta = 3329, 3, 2, 1
         zeropol = modpol(q, n, [0, 0, 0])  # 1 / 3^3
         zero = vec(zeropol, zeropol)  # proba 1 / 3^(3*2) = 1 / 729
-        seen0 = False
-        for _ in range(10000):
-            seen0 |= Vec.rand_small_uni(q, n, k, eta) == zero
+        # any() stops at the first hit, so about 729 iterations on average
+        seen0 = any(Vec.rand_small_uni(q, n, k, eta) == zero for _ in range(10000))
         self.assertTrue(seen0)
 
 
@@ -307,9 +279,7 @@ class MatTest(unittest.TestCase):
         # Ensure we get objects of the right shape
         q, n, k = 3, 2, 1
         zero = mat(vec(modpol(q, n, [0, 0])))  # proba 1 / 3^(2*1)
-        seen0 = False
-        for _ in range(100):
-            seen0 |= Mat.rand_uni(q, n, k) == zero
+        seen0 = any(Mat.rand_uni(q, n, k) == zero for _ in range(100))
         self.assertTrue(seen0)
 
     def test_transpose(self):
@@ -5,9 +5,14 @@ This is section 4.2 from the spec¹: conversion and compression
 algorithms (4.2.1), as well as sampling algorithms (4.2.2).
 ¹ https://nvlpubs.nist.gov/nistpubs/FIPS/NIST.FIPS.203.pdf
 
+It also has the NTT from section 4.3, but only used internally as a fast
+way to multiply polynomials: the rest of the code doesn't use the NTT domain.
+
 For a version closer to the lectures/slides, see previous commits.
 """
 
+import functools
+
 from common_math import ModInt, ModPol, Vec, Mat
 
 from kyber_sym import XOF
@@ -51,42 +56,150 @@ def bits_from_bytes(B):
 
 def bytes_from_ints(d, F):
     """Algorithm 5 ByteEncode_d from the spec (p. 22)."""
-    return bytes_from_bits(bits_from_ints(d, F))
+    # Same as bytes_from_bits(bits_from_ints(d, F)), but instead of a list
+    # of bits, use a single (little-endian) integer, which is much faster.
+    F = list(F)
+    x = 0
+    for a in reversed(F):
+        x = x * 2**d + a
+    return x.to_bytes(d * len(F) // 8, "little")
 
 
 def ints_from_bytes(d, B):
     """Algorithm 6 ByteDecode_d from the spec (p. 22)."""
-    return ints_from_bits(d, bits_from_bytes(B))
+    # Same as ints_from_bits(d, bits_from_bytes(B)), see bytes_from_ints().
+    x = int.from_bytes(B, "little")
+    return [(x >> (d * i)) % 2**d for i in range(8 * len(B) // d)]
+
+
+def bitrev7(i):
+    """Reverse the order of bits in a 7-bit integer."""
+    return int(f"{i:07b}"[::-1], 2)
+
+
+# Precomputed zeta^BitRev7(i) and zeta^(2 BitRev7(i) + 1)
+# with zeta = 17, a primitive 256-th root of unity mod q.
+zetas = [pow(17, bitrev7(i), q) for i in range(128)]
+gammas = [pow(17, 2 * bitrev7(i) + 1, q) for i in range(128)]
+
+
+def ntt(f):
+    """Algorithm 9 NTT from the spec, on a list of n integers."""
+    f_hat = list(f)
+    i = 1
+    length = 128
+    while length >= 2:
+        for start in range(0, n, 2 * length):
+            zeta = zetas[i]
+            i += 1
+            for j in range(start, start + length):
+                t = zeta * f_hat[j + length] % q
+                f_hat[j + length] = (f_hat[j] - t) % q
+                f_hat[j] = (f_hat[j] + t) % q
+        length //= 2
+    return f_hat
+
+
+def ntt_inv(f_hat):
+    """Algorithm 10 NTT^-1 from the spec, on a list of n integers."""
+    f = list(f_hat)
+    i = 127
+    length = 2
+    while length <= 128:
+        for start in range(0, n, 2 * length):
+            zeta = zetas[i]
+            i -= 1
+            for j in range(start, start + length):
+                t = f[j]
+                f[j] = (t + f[j + length]) % q
+                f[j + length] = zeta * (f[j + length] - t) % q
+        length *= 2
+    return [x * 3303 % q for x in f]  # 3303 = 128^-1 mod q
+
+
+def multiply_ntts(f_hat, g_hat):
+    """Algorithm 11 MultiplyNTTs from the spec (with Algorithm 12 inlined)."""
+    h_hat = []
+    for i in range(128):
+        a0, a1 = f_hat[2 * i], f_hat[2 * i + 1]
+        b0, b1 = g_hat[2 * i], g_hat[2 * i + 1]
+        # Algorithm 12 BaseCaseMultiply: (a0 + a1 X) (b0 + b1 X) mod X^2 - gamma
+        h_hat.append((a0 * b0 + a1 * b1 * gammas[i]) % q)
+        h_hat.append((a0 * b1 + a1 * b0) % q)
+    return h_hat
 
 
 class KModInt(ModInt):
     """Modular integer with Kyber extras."""
 
+    __slots__ = ()
+
     def compress(self, d):
         """Compress (slide 57 or Compress_d eq. (4.7) p. 21)."""
-        # round() is not what we want as round(0.5) == 0
-        # int(0.5 + x) is what we want.
-        return int(0.5 + self.r * 2**d / q) % 2**d
+        # round() is not what we want as round(0.5) == 0: we want rounding
+        # up for ties, that is round(a / b) = floor((2a + b) / 2b).
+        # Stick to integers: no floating-point errors and it's faster.
+        return (2 * 2**d * self.r + q) // (2 * q) % 2**d
 
     @classmethod
     def decompress(cls, d, y):
         """Decompress (slide 57 or Decompress_d eq. (4.8) p. 21)."""
         # See comment on compress().
-        return cls(int(0.5 + y * q / 2**d), q)
+        return cls((2 * q * y + 2**d) // (2 * 2**d), q)
 
     @classmethod
     def cbd_from_bits(cls, eta, bits):
-        """Small (size <= eta) modular integer with CBD from bits."""
-        # This is lines 3, 4 and 5 (rhs) of Algorithm 8 SamplePolyCBD
-        r = sum(bits[:eta]) - sum(bits[eta:])
-        return cls(r, q)
+        """Small (size <= eta) modular integer with CBD from 2 eta bits."""
+        # This is lines 3, 4 and 5 (rhs) of Algorithm 8 SamplePolyCBD,
+        # with the bits packed into an integer (first bit is least significant)
+        # so that the sums of bits are just population counts.
+        x = (bits % 2**eta).bit_count()
+        y = (bits >> eta).bit_count()
+        return cls(x - y, q)
 
 
 class KModPol(ModPol):
     """Element of R_q with Kyber extras."""
 
+    __slots__ = ("c_hat",)
+
     coef_cls = KModInt
 
+    def __init__(self, *args):
+        """Same as ModPol.__init__."""
+        super().__init__(*args)
+        self.c_hat = None  # NTT(self), computed when first needed
+
+    def __add__(self, other):
+        """Add another KModPol."""
+        # Add representatives directly rather than through KModInt.__add__.
+        c = [self.coef_cls(a.r + b.r, q) for a, b in zip(self.c, other.c)]
+        return type(self)(q, n, c)
+
+    def __sub__(self, other):
+        """Subtract another KModPol."""
+        c = [self.coef_cls(a.r - b.r, q) for a, b in zip(self.c, other.c)]
+        return type(self)(q, n, c)
+
+    def __mul__(self, other):
+        """Multiply by another KModPol."""
+        # Same result as ModPol.__mul__ but specialized for Kyber's fixed
+        # q and n: go through the NTT, which is O(n log n) instead of O(n^2).
+        return self.from_ntt(multiply_ntts(self.to_ntt(), other.to_ntt()))
+
+    def to_ntt(self):
+        """Return NTT(self) as a tuple of integers."""
+        # The same polynomial is often multiplied several times (for example
+        # each s[j] with every line of A), so only compute this once.
+        if self.c_hat is None:
+            self.c_hat = tuple(ntt([int(c_i) for c_i in self.c]))
+        return self.c_hat
+
+    @classmethod
+    def from_ntt(cls, f_hat):
+        """Build NTT^-1(f_hat) from a list of integers."""
+        return cls(q, n, [cls.coef_cls(c_i, q) for c_i in ntt_inv(f_hat)])
+
     def to_bytes(self):
         """Serialize: ByteEncode_12 from the spec."""
         return bytes_from_ints(12, (int(c_i) for c_i in self.c))
@@ -114,19 +227,30 @@ class KModPol(ModPol):
         # The algorithm in the spec ouputs 256 elements in Z_q, which are
         # meant to be interpreted as a polynomial in the NTT domain.
         # Here we interpret them as a normal polynomial instead because we
-        # haven't implemented NTT yet.
-
+        # only use the NTT internally for multiplication.
         ctx = XOF()
         ctx.absorb(B)
+        return cls.uni_from_xof(ctx)
+
+    @classmethod
+    def uni_from_xof(cls, ctx):
+        """Generate pseudo-random element of R_q from an XOF with the seed."""
+        # Lines 4-14 of Algorithm 7 SampleNTT, see uni_from_seed() above.
         a = []
         while len(a) < n:
-            C = ctx.squeeze(3)
-            # pylint: disable-next=unbalanced-tuple-unpacking
-            d1, d2 = ints_from_bytes(12, C)
-            if d1 < q:
-                a.append(cls.coef_cls(d1, q))
-            if d2 < q and len(a) < n:
-                a.append(cls.coef_cls(d2, q))
+            # The spec squeezes 3 bytes at a time; squeeze a whole SHAKE128
+            # block (168 bytes) instead and go through it 3 bytes at a time.
+            block = ctx.squeeze(168)
+            for i in range(0, len(block), 3):
+                C = block[i : i + 3]
+                # Lines 5-6 of Algorithm 7: same as ByteDecode_12(C), but
+                # without going through a list of bits.
+                d1 = C[0] + 256 * (C[1] % 16)
+                d2 = C[1] // 16 + 16 * C[2]
+                if d1 < q and len(a) < n:
+                    a.append(cls.coef_cls(d1, q))
+                if d2 < q and len(a) < n:
+                    a.append(cls.coef_cls(d2, q))
 
         return cls(q, n, a)
 
@@ -136,19 +260,32 @@ class KModPol(ModPol):
         # This is Algorithm 8 SamplePolyCBD_eta, plus the PRF invocation.
         B = prf.next(eta)
         assert len(B) == 64 * eta
-        bits = bits_from_bytes(B)
-        c = [
-            cls.coef_cls.cbd_from_bits(eta, bits[i : i + 2 * eta])
-            for i in range(0, len(bits), 2 * eta)
-        ]
+        # Same as BytesToBits(B), but as a single integer.
+        bits = int.from_bytes(B, "little")
+        c = []
+        for _ in range(n):
+            c.append(cls.coef_cls.cbd_from_bits(eta, bits % 2 ** (2 * eta)))
+            bits >>= 2 * eta
         return cls(q, n, c)
 
 
 class KVec(Vec):
     """Element of R_q^k with Kyber extras."""
 
+    __slots__ = ()
+
     item_cls = KModPol
 
+    def __mul__(self, other):
+        """Inner product with another KVec; result is a KModPol."""
+        # Same as Vec.__mul__ but sum the products in the NTT domain,
+        # so that we only need one NTT^-1 instead of one per term.
+        h_hat = [0] * n
+        for f, g in zip(self.v, other.v):
+            fg_hat = multiply_ntts(f.to_ntt(), g.to_ntt())
+            h_hat = [(a + b) % q for a, b in zip(h_hat, fg_hat)]
+        return self.item_cls.from_ntt(h_hat)
+
     def to_bytes(self):
         """Serialize."""
         return b"".join(x.to_bytes() for x in self.v)
@@ -185,6 +322,8 @@ class KVec(Vec):
 class KMat(Mat):
     """Matrix of elements of R_q with Kyber extras."""
 
+    __slots__ = ()
+
     line_cls = KVec
     item_cls = KModPol
 
@@ -192,20 +331,30 @@ class KMat(Mat):
         """Serialize (line-wise, only used in tests)."""
         return b"".join(l.to_bytes() for l in self.lines)
 
+    # The same matrix is generated again on each encryption with a given
+    # public key (including the one in decapsulation) and since objects are
+    # immutable, it can be reused. rho is public so caching it is fine.
     @classmethod
+    @functools.lru_cache(maxsize=8)
     def uni_from_seed(cls, k, rho):
         """Generate pseudo-random square matrix based on a seed."""
         # This is lines 3-7 in Algorithm 13 K-PKE.KeyGen or equivalently
         # lines 4-8 in Algorithm 14 K-PKE.Encrypt in the spec,
         # except the result is supposed to be interpret it as in the NTT
         # domain, but we interpret it as normal polynomials instead
-        # because we haven't implementet NTT yet.
+        # because we only use the NTT internally for multiplication.
+        # All seeds start with rho, so we absorb it only once and start each
+        # entry from a copy of that XOF; this gives the same output as
+        # absorbing rho + j + i into a fresh XOF.
+        base = XOF()
+        base.absorb(rho)
         a = []
         for i in range(k):
             a_i = []
             for j in range(k):
-                B = rho + j.to_bytes(1) + i.to_bytes(1)
-                a_ij = cls.item_cls.uni_from_seed(B)
+                ctx = base.copy()
+                ctx.absorb(j.to_bytes(1) + i.to_bytes(1))
+                a_ij = cls.item_cls.uni_from_xof(ctx)
                 a_i.append(a_ij)
             a.append(cls.line_cls(a_i))
 
@@ -1,6 +1,13 @@
 import unittest
 
-from kyber_math import KModInt, KModPol, KVec, KMat
+import math
+import secrets
+from fractions import Fraction
+
+from common_math import ModInt, ModPol
+from kyber_math import KModInt, KModPol, KVec, KMat, ntt, ntt_inv
+from kyber_math import bits_from_ints, bytes_from_bits, bytes_from_ints
+from kyber_math import bits_from_bytes, ints_from_bits, ints_from_bytes
 from kyber_sym import PRF
 
 from test_common import get
@@ -12,7 +19,60 @@ def kmodpol(c):
     return KModPol(q, n, [KModInt(a, q) for a in c])
 
 
+class ByteEncodeDecodeTest(unittest.TestCase):
+    def test_same_as_with_bits(self):
+        # Compare with the bit-by-bit version from the spec
+        for d in range(1, 13):
+            F = [secrets.randbelow(2**d) for _ in range(256)]
+            B = bytes_from_bits(bits_from_ints(d, F))
+            self.assertEqual(bytes_from_ints(d, F), B)
+            self.assertEqual(ints_from_bytes(d, B), F)
+            self.assertEqual(ints_from_bits(d, bits_from_bytes(B)), F)
+
+
+class KModIntTest(unittest.TestCase):
+    def test_compress_decompress(self):
+        # Compare with exact rationals, rounding ties up
+        q = 3329
+        for d in (1, 4, 5, 10, 11):
+            for x in range(q):
+                ref = math.floor(Fraction(2**d * x, q) + Fraction(1, 2)) % 2**d
+                self.assertEqual(KModInt(x, q).compress(d), ref)
+            for y in range(2**d):
+                ref = math.floor(Fraction(q * y, 2**d) + Fraction(1, 2))
+                self.assertEqual(KModInt.decompress(d, y), KModInt(ref, q))
+
+
+class NTTTest(unittest.TestCase):
+    def test_ntt(self):
+        for bits in (512, 768, 1024):
+            filename = f"ML-KEM-{bits}.txt"
+
+            s0, _ = get(filename, "s[0]")
+            ref_s0_hat, _ = get(filename, "NTT(s[0])")
+
+            self.assertEqual(ntt(s0), ref_s0_hat)
+            self.assertEqual(ntt_inv(ref_s0_hat), s0)
+
+
 class KModPolTest(unittest.TestCase):
+    def test_add_sub_mul(self):
+        # Compare with the generic implementation
+        q, n = 3329, 256
+        f = KModPol.rand_uni(q, n)
+        g = KModPol.rand_uni(q, n)
+
+        def generic(h):
+            return ModPol(q, n, [ModInt(int(c), q) for c in h.c])
+
+        def ints(h):
+            return [int(c) for c in h.c]
+
+        gf, gg = generic(f), generic(g)
+        self.assertEqual(ints(f + g), ints(gf + gg))
+        self.assertEqual(ints(f - g), ints(gf - gg))
+        self.assertEqual(ints(f * g), ints(gf * gg))
+
     def test_to_bytes_and_from_bytes(self):
         for bits in (512, 768, 1024):
             filename = f"ML-KEM-{bits}.txt"
@@ -50,9 +110,9 @@ class KModPolTest(unittest.TestCase):
 
             rho = get(filename, "ρ")
             exp_i, _ = get(filename, "A[0, 0]")
-            B = rho + bytes.fromhex("0000")
+            B = rho + bytes([0, 0])  # j, i = 0, 0 for A[0, 0]
             gen = KModPol.uni_from_seed(B)
-            self.assertEqual(gen, kmodpol(exp_i))
+            self.assertEqual([int(c) for c in gen.c], exp_i)
 
     def test_cbd_from_prf(self):
         for bits, eta1 in ((512, 3), (768, 2), (1024, 2)):
@@ -68,6 +128,15 @@ class KModPolTest(unittest.TestCase):
 
 
 class KVecTest(unittest.TestCase):
+    def test_mul(self):
+        # Compare with the generic implementation
+        q, n, k = 3329, 256, 3
+        a = KVec.rand_uni(q, n, k)
+        b = KVec.rand_uni(q, n, k)
+
+        ref = sum((f * g for f, g in zip(a.v, b.v)), start=a.v[0] - a.v[0])
+        self.assertEqual(a * b, ref)
+
     def test_from_bytes_to_bytes(self):
         for bits in (512, 768, 1024):
             filename = f"ML-KEM-{bits}.txt"
@@ -19,16 +19,32 @@ class XOF:
         # The hashlib API doesn't have a streaming squeeze() API
         # so we'll emulate it using digest() and an offset.
         self.offset = 0
+        # digest() always starts from the beginning, so we keep the output
+        # we already have around and only call it again when we need more.
+        self.buf = b""
 
     def absorb(self, data):
         """Absorb data."""
         self.ctx.update(data)
         self.offset = 0
+        self.buf = b""
+
+    def copy(self):
+        """Return an independent copy of this XOF context."""
+        other = XOF.__new__(XOF)
+        other.ctx = self.ctx.copy()
+        other.offset = self.offset
+        other.buf = self.buf
+        return other
 
     def squeeze(self, l):
         """Squeeze the next l bytes out."""
-        # This is very inefficient but it works.
-        out = self.ctx.digest(self.offset + l)[self.offset :]
+        if self.offset + l > len(self.buf):
+            # Get at least one block (SHAKE128 rate is 168 bytes) and double
+            # the size each time so the total cost stays linear.
+            size = max(self.offset + l, 2 * len(self.buf), 168)
+            self.buf = self.ctx.digest(size)
+        out = self.buf[self.offset : self.offset + l]
         self.offset += l
         return out
 
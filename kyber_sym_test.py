@@ -1,10 +1,39 @@
 import unittest
 
-from kyber_sym import G, H, J
+import hashlib
+
+from kyber_sym import XOF, G, H, J
 
 from test_common import get
 
 
+class XOFTest(unittest.TestCase):
+    def test_squeeze(self):
+        # Squeezing in several steps gives the same as all at once
+        seed = bytes(range(34))
+        ref = hashlib.shake_128(seed).digest(1000)
+
+        xof = XOF()
+        xof.absorb(seed)
+        got = b"".join(xof.squeeze(l) for l in (3, 165, 1, 300, 531))
+
+        self.assertEqual(got, ref)
+
+    def test_copy(self):
+        # Absorbing into a copy doesn't affect the original
+        seed = bytes(range(32))
+        base = XOF()
+        base.absorb(seed)
+
+        ctx = base.copy()
+        ctx.absorb(b"\x01\x02")
+        ref = hashlib.shake_128(seed + b"\x01\x02").digest(500)
+        self.assertEqual(ctx.squeeze(500), ref)
+
+        ref = hashlib.shake_128(seed).digest(500)
+        self.assertEqual(base.squeeze(500), ref)
+
+
 class GTest(unittest.TestCase):
     def test_kpke_keygen(self):
         # Test G() as used in K-PKE.KeyGen: (rho, sigma) := G(d||k)
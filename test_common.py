@@ -1,18 +1,27 @@
 """Auxiliary functions used by more than one test file."""
 
+import functools
 
-def get(filename, varname):
-    """Read a value from a ML-KEM-*.txt file."""
-    prefix = varname + " = "
+
+@functools.lru_cache(maxsize=None)
+def _load(filename):
+    """Read all values from a ML-KEM-*.txt file, as strings."""
+    values = {}
     with open(filename, encoding="utf8") as f:
         for line in f:
-            if line.startswith(prefix):
-                val = line.strip()[len(prefix) :]
-                break
+            name, val = line.strip().split(" = ", 1)
+            values[name] = val
+    return values
+
+
+@functools.lru_cache(maxsize=None)
+def _parse(filename, varname):
+    """Parse a value from a ML-KEM-*.txt file (only once)."""
+    val = _load(filename)[varname]
     # is this a list of integers?
     if val[0] == "{":
         end = val.find("}")
-        lst = [int(v) for v in val[1:end].split(", ")]
+        lst = tuple(int(v) for v in val[1:end].split(", "))
         # the list is followed by its serialized version
         start = end + len("} = ")
         ser = bytes.fromhex(val[start:])
@@ -21,3 +30,14 @@ def get(filename, varname):
 
     # if not, it must be bytes
     return bytes.fromhex(val)
+
+
+def get(filename, varname):
+    """Read a value from a ML-KEM-*.txt file."""
+    val = _parse(filename, varname)
+    if isinstance(val, tuple):
+        # give the caller its own copy of the list, not the cached one
+        lst, ser = val
+        return list(lst), ser
+
+    return val